@@ -2,85 +2,183 @@
 PyTest configuration and fixtures for U-Ask chatbot automation.
 """
 import pytest
+import base64
 import json
 import os
+import shutil
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from utils.driver_factory import DriverFactory
+from utils.response_analyzer import AnalyzedResponse
 from utils.wait_utils import WaitUtils
 
 
 # Configuration: Chatbot URL - can be overridden via environment variable
 CHATBOT_URL = os.getenv("CHATBOT_URL", "https://uask.gov.ae")
 
+# Resolved ChromeDriver path, persisted across runs to skip webdriver-manager's network lookup
+CHROMEDRIVER_CACHE_FILE = Path(__file__).parent.resolve() / ".pytest_cache" / "chromedriver_path"
+
+
+def _find_cached_chromedriver():
+    """Locate an already-downloaded ChromeDriver binary without touching the network."""
+    if CHROMEDRIVER_CACHE_FILE.is_file():
+        cached_path = CHROMEDRIVER_CACHE_FILE.read_text(encoding="utf-8").strip()
+        if os.path.isfile(cached_path):
+            return cached_path
+    
+    # Fall back to the newest binary webdriver-manager has downloaded before
+    wdm_dir = Path.home() / ".wdm" / "drivers" / "chromedriver"
+    if not wdm_dir.is_dir():
+        return None
+    candidates = [
+        path for path in wdm_dir.rglob("chromedriver*")
+        if path.name in ("chromedriver", "chromedriver.exe") and path.is_file()
+    ]
+    if not candidates:
+        return None
+    return str(max(candidates, key=lambda path: path.stat().st_mtime))
+
+
+CACHED_DRIVER = os.environ.get("CHROMEDRIVER_PATH") or _find_cached_chromedriver()
+if CACHED_DRIVER:
+    os.environ["CHROMEDRIVER_PATH"] = CACHED_DRIVER
+
+
+# Persistent Chrome profiles keep the chatbot's static assets in the HTTP cache between runs
+CHROME_PROFILE_ROOT = Path(__file__).parent.resolve() / ".pytest_cache" / "chrome-profile"
+
+
+def _chrome_profile_dir(chatbot_url):
+    """
+    Return this worker's persistent Chrome profile, wiping it if the chatbot URL changed.
+    
+    Each xdist worker gets its own directory since Chrome locks a profile per process.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    profile_dir = CHROME_PROFILE_ROOT / worker
+    url_file = CHROME_PROFILE_ROOT / f"{worker}.url"
+    
+    if url_file.is_file() and url_file.read_text(encoding="utf-8") != chatbot_url:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+    CHROME_PROFILE_ROOT.mkdir(parents=True, exist_ok=True)
+    url_file.write_text(chatbot_url, encoding="utf-8")
+    return profile_dir
+
+
+# Stash key holding each test's call-phase report, read by the screenshot-on-failure logic
+_CALL_REPORT = pytest.StashKey[pytest.TestReport]()
+
+
+# Resolved once so lookups do not depend on the working directory of each worker
+_TEST_DATA_PATH = (Path(__file__).parent / "data" / "test_data.json").resolve()
+
 
 @pytest.fixture(scope="session")
 def config():
     """Load test configuration from environment or defaults."""
     return {
         "chatbot_url": CHATBOT_URL,
-        "headless": os.getenv("HEADLESS", "false").lower() == "true",
+        # Headless by default on CI, headed locally unless HEADLESS says otherwise
+        "headless": os.getenv("HEADLESS", "true" if os.getenv("CI") else "false").lower() == "true",
         "implicit_wait": 0,  # We use explicit waits only
         "page_load_timeout": 30,
+        # Set when the runner mounts a large tmpfs /dev/shm (docker run --shm-size=2g)
+        "use_dev_shm": os.getenv("CHROME_USE_DEV_SHM", "false").lower() == "true",
         "screenshot_on_failure": True
     }
 
 
-@pytest.fixture(scope="function")
-def driver(config, request):
-    """Create and configure WebDriver instance for each test."""
-    driver_instance = DriverFactory.create_driver(
+@pytest.fixture(scope="session")
+def driver(config):
+    """Create a single WebDriver per worker, with the chatbot already loaded, shared by the whole session."""
+    from pages.chat_page import ChatPage
+    driver_instance = DriverFactory.create_warm_driver(
+        config["chatbot_url"],
+        ChatPage.CHAT_INPUT,
         headless=config["headless"],
-        page_load_timeout=config["page_load_timeout"]
+        page_load_timeout=config["page_load_timeout"],
+        profile_dir=_chrome_profile_dir(config["chatbot_url"]),
+        use_dev_shm=config["use_dev_shm"]
     )
-    yield driver_instance
     
-    # Cleanup: Take screenshot on failure
-    if config["screenshot_on_failure"]:
-        # Check test outcome using pytest hook
-        if hasattr(request.node, 'rep_call') and request.node.rep_call.outcome == "failed":
-            screenshot_path = Path("screenshots") / f"{request.node.name}.png"
-            screenshot_path.parent.mkdir(exist_ok=True)
-            try:
-                driver_instance.save_screenshot(str(screenshot_path))
-            except:
-                pass  # Continue even if screenshot fails
+    # Persist the resolved driver path so the next run skips the lookup
+    try:
+        CHROMEDRIVER_CACHE_FILE.parent.mkdir(exist_ok=True)
+        CHROMEDRIVER_CACHE_FILE.write_text(DriverFactory.get_driver_path(), encoding="utf-8")
+    except OSError:
+        pass  # Caching is an optimization only
     
+    yield driver_instance
     driver_instance.quit()
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def wait(driver):
     """Provide WaitUtils instance for explicit waits."""
     return WaitUtils(driver)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def test_data():
-    """Load test data from JSON file."""
-    data_path = Path("data") / "test_data.json"
-    with open(data_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Load test data from JSON file (immutable, so loaded once per session)."""
+    return json.loads(_TEST_DATA_PATH.read_bytes())
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def chat_page(driver, wait, config):
-    """Initialize ChatPage with driver and navigate to chatbot."""
+    """Initialize ChatPage on the chatbot page the warm driver has already loaded."""
     from pages.chat_page import ChatPage
     page = ChatPage(driver, wait)
-    page.navigate_to_chatbot(config["chatbot_url"])
+    page.attach_to_loaded_page()
     return page
 
 
+@pytest.fixture(scope="session")
+def valid_service_response(chat_page, test_data, config):
+    """Send the valid public-service query once and share the analyzed AI response across tests."""
+    # Session fixtures run before reset_chat, so start from a clean conversation here too
+    chat_page.reset_conversation(config["chatbot_url"])
+    query = test_data["queries"]["english"]["valid_public_service"]["prompt"]
+    return AnalyzedResponse.from_text(chat_page.send_and_await_response(query))
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset_chat(request, chat_page, config):
+    """Reset chat state before each test so the shared browser starts from a clean conversation."""
+    # Tests that share a seeded conversation opt out of the reset
+    if request.node.get_closest_marker("keep_conversation") is None:
+        chat_page.reset_conversation(config["chatbot_url"])
+    yield
+    
+    # Cleanup: Take screenshot on failure (driver is shared, so capture it per test here)
+    if config["screenshot_on_failure"]:
+        # Check test outcome using pytest hook
+        call_report = request.node.stash.get(_CALL_REPORT, None)
+        if call_report is not None and call_report.failed:
+            worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+            screenshot_path = Path("screenshots") / f"{worker}-{request.node.name}.jpg"
+            screenshot_path.parent.mkdir(exist_ok=True)
+            try:
+                # CDP capture as compressed JPEG - far smaller than the W3C PNG endpoint
+                screenshot = chat_page.driver.execute_cdp_cmd(
+                    "Page.captureScreenshot", {"format": "jpeg", "quality": 60}
+                )
+                screenshot_path.write_bytes(base64.b64decode(screenshot["data"]))
+            except:
+                pass  # Continue even if screenshot fails
+
+
 # Hook to capture test outcome for screenshot on failure
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Capture test outcome for screenshot on failure."""
     outcome = yield
     rep = outcome.get_result()
-    setattr(item, f"rep_{rep.when}", rep)
+    if rep.when == "call":
+        item.stash[_CALL_REPORT] = rep
 
 
@@ -3,7 +3,6 @@ AI/GPT Response Validation Tests for U-Ask Chatbot
 Tests AI response quality, consistency, formatting, and hallucination detection.
 """
 import pytest
-import re
 from pages.chat_page import ChatPage
 
 
@@ -11,22 +10,19 @@ from pages.chat_page import ChatPage
 class TestAIResponses:
     """Test suite for AI/GPT-powered response validation."""
     
-    def test_ai_response_is_non_empty(self, chat_page, test_data):
+    def test_ai_response_is_non_empty(self, valid_service_response):
         """
         Verify AI provides a non-empty response to valid queries.
         
         AI Testing Note: We check for non-empty responses rather than exact text matching
         because GPT models generate dynamic responses. Exact matching would cause false failures.
         """
-        query = test_data["queries"]["english"]["valid_public_service"]["prompt"]
-        
-        chat_page.send_message(query)
-        response = chat_page.get_latest_ai_response()
+        response = valid_service_response.text
         
         assert len(response.strip()) > 0, "AI response should not be empty"
         assert response.strip() != "", "AI response should contain meaningful content"
     
-    def test_ai_response_is_meaningful(self, chat_page, test_data):
+    def test_ai_response_is_meaningful(self, valid_service_response, test_data):
         """
         Verify AI response is meaningful and relevant to the query.
         
@@ -35,11 +31,8 @@ class TestAIResponses:
         contain relevant keywords or concepts.
         """
         query_data = test_data["queries"]["english"]["valid_public_service"]
-        query = query_data["prompt"]
         min_length = query_data["min_length"]
-        
-        chat_page.send_message(query)
-        response = chat_page.get_latest_ai_response()
+        response = valid_service_response.text
         
         # Check minimum length (too short responses may indicate issues)
         assert len(response) >= min_length, \
@@ -50,21 +43,18 @@ class TestAIResponses:
         assert len(response) <= max_length, \
             f"AI response should not exceed {max_length} characters. Got: {len(response)}"
     
-    def test_ai_response_no_broken_html(self, chat_page, test_data):
+    def test_ai_response_no_broken_html(self, valid_service_response):
         """
         Verify AI response does not contain broken HTML or script tags.
         
         AI Testing Note: We check for malformed HTML that could break the UI.
         This is a critical validation to ensure responses render correctly.
         """
-        query = test_data["queries"]["english"]["valid_public_service"]["prompt"]
-        
-        chat_page.send_message(query)
-        response = chat_page.get_latest_ai_response()
+        response = valid_service_response
         
         # Check for unclosed HTML tags (basic validation)
-        open_tags = len(re.findall(r'<[^/][^>]*>', response))
-        close_tags = len(re.findall(r'</[^>]+>', response))
+        open_tags = response.open_tags
+        close_tags = response.close_tags
         
         # Allow some imbalance for self-closing tags, but flag significant issues
         if open_tags > 5:  # Only check if there are HTML tags
@@ -73,20 +63,17 @@ class TestAIResponses:
                 f"Response may contain broken HTML. Open tags: {open_tags}, Close tags: {close_tags}"
         
         # Check for script tags (should not be in AI response)
-        assert "<script" not in response.lower(), \
+        assert "<script" not in response.lower, \
             "AI response should not contain script tags"
     
-    def test_ai_response_no_incomplete_thoughts(self, chat_page, test_data):
+    def test_ai_response_no_incomplete_thoughts(self, valid_service_response):
         """
         Verify AI response is complete and doesn't end mid-sentence.
         
         AI Testing Note: Incomplete responses can indicate API timeouts or model issues.
         We check for proper sentence endings and reasonable structure.
         """
-        query = test_data["queries"]["english"]["valid_public_service"]["prompt"]
-        
-        chat_page.send_message(query)
-        response = chat_page.get_latest_ai_response()
+        response = valid_service_response.text
         
         # Response should not end with incomplete indicators
         incomplete_indicators = ["...", "…", "and", "or", "but", "the", "a", "an"]
@@ -113,8 +100,7 @@ class TestAIResponses:
         arabic_query = test_data["queries"]["arabic"]["valid_public_service"]["prompt"]
         
         # Get English response
-        chat_page.send_message(english_query)
-        english_response = chat_page.get_latest_ai_response()
+        english_response = chat_page.send_and_await_response(english_query)
         
         # Small delay between requests
         import time
@@ -122,8 +108,7 @@ class TestAIResponses:
         
         # Get Arabic response (note: may need to switch language in UI first)
         # For this test, we assume language switching or the chatbot detects language
-        chat_page.send_message(arabic_query)
-        arabic_response = chat_page.get_latest_ai_response()
+        arabic_response = chat_page.send_and_await_response(arabic_query)
         
         # Both responses should be meaningful
         assert len(english_response.strip()) > 0, "English response should be non-empty"
@@ -149,12 +134,9 @@ class TestAIResponses:
         # Note: This may not always trigger an error, but we check error handling
         problematic_message = "A" * 1000  # Very long message
         
-        chat_page.send_message(problematic_message)
-        
         # Wait for either response or error
         try:
-            chat_page.wait_for_ai_response(timeout=15)
-            response = chat_page.get_latest_ai_response()
+            response = chat_page.send_and_await_response(problematic_message, timeout=15)
             
             # If we get a response, check if it's an error message
             error_message = chat_page.get_error_message()
@@ -171,29 +153,25 @@ class TestAIResponses:
             if error_message:
                 assert len(error_message) > 0, "Error message should appear on timeout"
     
-    def test_ai_response_formatting_clean(self, chat_page, test_data):
+    def test_ai_response_formatting_clean(self, valid_service_response):
         """
         Verify AI response formatting is clean and readable.
         
         AI Testing Note: Clean formatting ensures good user experience. We check for
         excessive whitespace, proper line breaks, and absence of formatting artifacts.
         """
-        query = test_data["queries"]["english"]["valid_public_service"]["prompt"]
-        
-        chat_page.send_message(query)
-        response = chat_page.get_latest_ai_response()
+        response = valid_service_response
         
         # Check for excessive consecutive whitespace
-        excessive_whitespace = re.search(r'\s{5,}', response)
-        assert not excessive_whitespace, \
+        assert not response.has_excess_whitespace, \
             "Response should not contain excessive whitespace"
         
         # Check for control characters (except common ones like newline, tab)
-        control_chars = re.findall(r'[\x00-\x08\x0B-\x0C\x0E-\x1F]', response)
+        control_chars = response.control_chars
         assert len(control_chars) == 0, \
             f"Response should not contain control characters. Found: {control_chars}"
     
-    def test_ai_hallucination_detection_heuristics(self, chat_page, test_data):
+    def test_ai_hallucination_detection_heuristics(self, valid_service_response):
         """
         Verify AI response doesn't show obvious hallucination patterns.
         
@@ -202,15 +180,12 @@ class TestAIResponses:
         obvious contradictions. This is a simplified approach - production systems
         might use more sophisticated methods like fact-checking APIs or knowledge graphs.
         """
-        query = test_data["queries"]["english"]["valid_public_service"]["prompt"]
-        
-        chat_page.send_message(query)
-        response = chat_page.get_latest_ai_response()
+        response = valid_service_response
         
         # Heuristic 1: Response should not be overly repetitive
-        words = response.lower().split()
+        words = response.words
         if len(words) > 10:
-            unique_words = len(set(words))
+            unique_words = len(response.unique_words)
             uniqueness_ratio = unique_words / len(words)
             assert uniqueness_ratio > 0.3, \
                 f"Response may be repetitive. Uniqueness ratio: {uniqueness_ratio}"
@@ -218,17 +193,17 @@ class TestAIResponses:
         # Heuristic 2: Response should not be too generic (contain specific terms)
         # For UAE government services, responses should mention relevant terms
         relevant_terms = ["emirates", "id", "renew", "service", "document", "uae", "government"]
-        response_lower = response.lower()
+        response_lower = response.lower
         has_relevant_terms = any(term in response_lower for term in relevant_terms)
         
         # Note: This is a soft check - some valid responses might not contain these terms
         # But for the specific query about Emirates ID, we expect some relevance
         
         # Heuristic 3: Response length should be reasonable (not too short, not too long)
-        assert 50 <= len(response) <= 2000, \
-            f"Response length should be reasonable. Got: {len(response)} characters"
+        assert 50 <= len(response.text) <= 2000, \
+            f"Response length should be reasonable. Got: {len(response.text)} characters"
         
         # Heuristic 4: Response should not contain obvious placeholders
         placeholders = ["[placeholder]", "[response]", "lorem ipsum", "test response"]
-        assert not any(placeholder in response.lower() for placeholder in placeholders), \
+        assert not any(placeholder in response_lower for placeholder in placeholders), \
             "Response should not contain placeholder text"
@@ -1,23 +1,77 @@
 """
 WebDriver factory for creating and configuring browser instances.
 """
+import os
+import threading
+from pathlib import Path
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
+from utils.wait_utils import WaitUtils
+
+
+# Third-party analytics, telemetry and web-font requests the chat tests never need
+BLOCKED_URL_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*segment.io*",
+    "*sentry.io*",
+    "*hotjar.com*",
+    "*doubleclick.net*",
+    "*.woff2",
+    "*.woff"
+]
 
 
 class DriverFactory:
     """Factory class for creating WebDriver instances with consistent configuration."""
     
+    # Resolved ChromeDriver path, shared by every driver created in this process
+    _driver_path = None
+    _lock = threading.Lock()
+    
+    @classmethod
+    def get_driver_path(cls):
+        """
+        Resolve the ChromeDriver binary, preferring an already-downloaded copy.
+        
+        webdriver-manager performs a network version lookup on every install() call,
+        so the path is resolved at most once per process and a binary exported via
+        CHROMEDRIVER_PATH is used as-is when it exists.
+        
+        Returns:
+            str: Path to the ChromeDriver executable
+        """
+        with cls._lock:
+            if cls._driver_path is not None and os.path.isfile(cls._driver_path):
+                return cls._driver_path
+            cached_path = os.environ.get("CHROMEDRIVER_PATH")
+            if cached_path and os.path.isfile(cached_path):
+                cls._driver_path = cached_path
+            else:
+                cls._driver_path = ChromeDriverManager().install()
+                os.environ["CHROMEDRIVER_PATH"] = cls._driver_path
+            return cls._driver_path
+    
+    @classmethod
+    def clear_driver_path(cls):
+        """Forget the resolved ChromeDriver so the next lookup downloads a fresh one."""
+        with cls._lock:
+            cls._driver_path = None
+            os.environ.pop("CHROMEDRIVER_PATH", None)
+    
     @staticmethod
-    def create_driver(headless=False, page_load_timeout=30):
+    def create_driver(headless=False, page_load_timeout=30, profile_dir=None, use_dev_shm=False):
         """
         Create and configure Chrome WebDriver instance.
         
         Args:
             headless (bool): Run browser in headless mode
             page_load_timeout (int): Maximum time to wait for page load (seconds)
+            profile_dir (Path): Optional persistent user-data-dir so the HTTP cache survives sessions
+            use_dev_shm (bool): Keep shared memory in /dev/shm; only safe when it is sized (e.g. --shm-size=2g)
         
         Returns:
             webdriver.Chrome: Configured Chrome WebDriver instance
@@ -25,23 +79,56 @@ class DriverFactory:
         chrome_options = Options()
         
         if headless:
-            chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--headless=new")
+            # Trim rendering and background work that headless runs never need
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--disable-software-rasterizer")
+            chrome_options.add_argument("--disable-background-networking")
+            chrome_options.add_argument("--disable-sync")
+            chrome_options.add_argument("--metrics-recording-only")
+        
+        # Only DOM readiness matters for chat tests - skip images and unneeded browser features
+        chrome_options.page_load_strategy = "eager"
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-features=Translate,BackForwardCache,MediaRouter")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
         
         # Standard Chrome options for stability
         chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
+        if not use_dev_shm:
+            # Docker's default 64MB /dev/shm crashes Chrome - fall back to disk-backed /tmp
+            chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
+        # Only severe browser console entries are inspected by tests
+        chrome_options.set_capability("goog:loggingPrefs", {"browser": "SEVERE"})
+        
         # Set window size for consistent testing
         chrome_options.add_argument("--window-size=1920,1080")
         
-        # Initialize service with webdriver-manager for automatic driver management
-        service = Service(ChromeDriverManager().install())
+        if profile_dir is not None:
+            profile_dir = Path(profile_dir).resolve()
+            profile_dir.mkdir(parents=True, exist_ok=True)
+            chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+            chrome_options.add_argument(f"--disk-cache-dir={profile_dir / 'cache'}")
+        
+        # Initialize service with cached driver, falling back to webdriver-manager
+        driver_path = DriverFactory.get_driver_path()
         
         # Create driver instance
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        try:
+            driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+        except SessionNotCreatedException:
+            # Cached driver may be stale after a Chrome update - fetch a matching one
+            DriverFactory.clear_driver_path()
+            driver_path = DriverFactory.get_driver_path()
+            driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
         driver.set_page_load_timeout(page_load_timeout)
         
         # Remove webdriver property to avoid detection
@@ -49,4 +136,43 @@ class DriverFactory:
             'source': 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
         })
         
+        # Drop analytics and font requests at the network layer so every navigation loads less
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        
+        return driver
+    
+    @staticmethod
+    def create_warm_driver(url, ready_locator, headless=False, page_load_timeout=30, profile_dir=None,
+                           use_dev_shm=False, ready_timeout=15):
+        """
+        Create a Chrome WebDriver that has already loaded the given page.
+        
+        Bootstrapping (JS bundle, connections, HTTP cache and localStorage) is paid once here,
+        so callers can reset in-page state instead of navigating for every test.
+        
+        Args:
+            url (str): Page to preload
+            ready_locator: Tuple of (By strategy, value) that is visible once the page is usable
+            headless (bool): Run browser in headless mode
+            page_load_timeout (int): Maximum time to wait for page load (seconds)
+            profile_dir (Path): Optional persistent user-data-dir so the warm cache survives sessions
+            use_dev_shm (bool): Keep shared memory in /dev/shm
+            ready_timeout (int): Maximum time to wait for ready_locator (seconds)
+        
+        Returns:
+            webdriver.Chrome: Configured Chrome WebDriver instance showing the loaded page
+        """
+        driver = DriverFactory.create_driver(
+            headless=headless,
+            page_load_timeout=page_load_timeout,
+            profile_dir=profile_dir,
+            use_dev_shm=use_dev_shm
+        )
+        try:
+            driver.get(url)
+            WaitUtils(driver).wait_for_element_visible(ready_locator, timeout=ready_timeout)
+        except:
+            driver.quit()
+            raise
         return driver
@@ -0,0 +1,58 @@
+"""
+Heuristic analysis of AI response text used by response validation tests.
+"""
+import re
+from dataclasses import dataclass
+
+
+# Precompiled patterns for response format checks
+_TAG_RE = re.compile(r'<(/?)[^>]+>')
+_EXCESS_WS_RE = re.compile(r'\s{5,}')
+_CTRL_CHAR_RE = re.compile(r'[\x00-\x08\x0B-\x0C\x0E-\x1F]')
+
+
+@dataclass(frozen=True)
+class AnalyzedResponse:
+    """AI response text together with metrics computed once for all assertions."""
+
+    text: str
+    lower: str
+    words: list
+    unique_words: set
+    control_chars: list
+    has_excess_whitespace: bool
+    open_tags: int
+    close_tags: int
+
+    @classmethod
+    def from_text(cls, text: str):
+        """
+        Analyze a response string in a single set of passes.
+
+        Args:
+            text: Raw AI response text
+
+        Returns:
+            AnalyzedResponse: Response with precomputed heuristics
+        """
+        lower = text.lower()
+        words = lower.split()
+
+        # Count opening and closing tags in one scan
+        open_tags = close_tags = 0
+        for tag in _TAG_RE.finditer(text):
+            if tag.group(1):
+                close_tags += 1
+            else:
+                open_tags += 1
+
+        return cls(
+            text=text,
+            lower=lower,
+            words=words,
+            unique_words=set(words),
+            control_chars=_CTRL_CHAR_RE.findall(text),
+            has_excess_whitespace=_EXCESS_WS_RE.search(text) is not None,
+            open_tags=open_tags,
+            close_tags=close_tags
+        )
@@ -10,17 +10,54 @@ from selenium.webdriver.remote.webelement import WebElement
 class WaitUtils:
     """Wrapper class for common explicit wait operations."""
     
-    def __init__(self, driver, timeout=10):
+    def __init__(self, driver, timeout=10, poll_frequency=None):
         """
         Initialize WaitUtils with driver and default timeout.
         
         Args:
             driver: WebDriver instance
             timeout (int): Default timeout in seconds
+            poll_frequency (float): Seconds between condition checks; None scales it with
+                each timeout (0.1s for short checks up to 0.5s for long waits)
         """
         self.driver = driver
         self.timeout = timeout
-        self.wait = WebDriverWait(driver, timeout)
+        self.poll_frequency = poll_frequency
+        # WebDriverWait instances reused per timeout instead of rebuilt on every call
+        self._wait_cache = {}
+        self.wait = self._get_wait(timeout)
+    
+    def _poll_frequency_for(self, timeout):
+        """
+        Pick a poll interval: fast for short checks, sparser for long waits to avoid flooding the driver.
+        
+        Args:
+            timeout: Wait timeout in seconds
+        
+        Returns:
+            float: Seconds between condition checks
+        """
+        if self.poll_frequency is not None:
+            return self.poll_frequency
+        return min(0.5, max(0.1, timeout / 50))
+    
+    def _get_wait(self, timeout=None):
+        """
+        Get a WebDriverWait for the given timeout, creating it once per distinct value.
+        
+        Args:
+            timeout: Optional custom timeout (uses default if None)
+        
+        Returns:
+            WebDriverWait: Cached wait instance
+        """
+        if timeout is None:
+            return self.wait
+        wait = self._wait_cache.get(timeout)
+        if wait is None:
+            wait = WebDriverWait(self.driver, timeout, poll_frequency=self._poll_frequency_for(timeout))
+            self._wait_cache[timeout] = wait
+        return wait
     
     def wait_for_element_visible(self, locator, timeout=None):
         """
@@ -33,7 +70,7 @@ class WaitUtils:
         Returns:
             WebElement: Visible element
         """
-        wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
+        wait = self._get_wait(timeout)
         return wait.until(EC.visibility_of_element_located(locator))
     
     def wait_for_element_clickable(self, locator, timeout=None):
@@ -47,7 +84,7 @@ class WaitUtils:
         Returns:
             WebElement: Clickable element
         """
-        wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
+        wait = self._get_wait(timeout)
         return wait.until(EC.element_to_be_clickable(locator))
     
     def wait_for_element_present(self, locator, timeout=None):
@@ -61,7 +98,7 @@ class WaitUtils:
         Returns:
             WebElement: Present element
         """
-        wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
+        wait = self._get_wait(timeout)
         return wait.until(EC.presence_of_element_located(locator))
     
     def wait_for_text_in_element(self, locator, text, timeout=None):
@@ -76,7 +113,7 @@ class WaitUtils:
         Returns:
             WebElement: Element containing the text
         """
-        wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
+        wait = self._get_wait(timeout)
         return wait.until(EC.text_to_be_present_in_element(locator, text))
     
     def wait_for_elements_present(self, locator, timeout=None, min_count=1):
@@ -91,7 +128,7 @@ class WaitUtils:
         Returns:
             list: List of WebElements
         """
-        wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
+        wait = self._get_wait(timeout)
         elements = wait.until(lambda d: d.find_elements(*locator))
         assert len(elements) >= min_count, f"Expected at least {min_count} elements, found {len(elements)}"
         return elements
@@ -104,9 +141,23 @@ class WaitUtils:
             locator: Tuple of (By strategy, value)
             timeout: Optional custom timeout
         """
-        wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
+        wait = self._get_wait(timeout)
         wait.until(EC.invisibility_of_element_located(locator))
     
+    def wait_for_condition(self, condition, timeout=None):
+        """
+        Wait for an arbitrary condition callable to return a truthy value.
+        
+        Args:
+            condition: Callable receiving the driver, e.g. lambda d: ...
+            timeout: Optional custom timeout
+        
+        Returns:
+            Truthy value returned by the condition
+        """
+        wait = self._get_wait(timeout)
+        return wait.until(condition)
+    
     def is_element_visible(self, locator, timeout=2):
         """
         Check if element is visible without raising exception.
@@ -119,7 +170,7 @@ class WaitUtils:
             bool: True if element is visible, False otherwise
         """
         try:
-            WebDriverWait(self.driver, timeout).until(EC.visibility_of_element_located(locator))
+            self._get_wait(timeout).until(EC.visibility_of_element_located(locator))
             return True
         except TimeoutException:
             return False
@@ -2,102 +2,89 @@
 Simple script to validate Python imports and syntax.
 Run this to check if all dependencies are available and code is syntactically correct.
 """
+import importlib.util
+import json
 import sys
+from pathlib import Path
+
+try:
+    import orjson  # Optional faster JSON parser
+except ImportError:
+    orjson = None
+
+
+# Standard library modules used by the framework
+STDLIB_MODULES = ["json", "os", "pathlib", "re", "time"]
+
+# Third-party dependencies: (module, display name, install hint)
+DEPENDENCIES = [
+    ("pytest", "PyTest", "pip install pytest"),
+    ("selenium", "Selenium", "pip install selenium"),
+    ("webdriver_manager", "webdriver-manager", "pip install webdriver-manager"),
+]
+
+# Project modules are compiled to catch syntax errors, but never executed
+PROJECT_MODULES = [
+    "utils.driver_factory",
+    "utils.wait_utils",
+    "utils.response_analyzer",
+    "pages.chat_page",
+    "tests.test_chat_ui",
+    "tests.test_ai_responses",
+    "tests.test_security",
+]
+
+TEST_DATA_PATH = Path(__file__).parent / "data" / "test_data.json"
+
+
+def _resolves(name):
+    """Check whether a module can be found without executing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
 
 def validate_imports():
-    """Check if all required imports work."""
+    """Check if all required imports resolve and project code compiles."""
     errors = []
     
     # Check standard library imports
-    try:
-        import json
-        import os
-        from pathlib import Path
-        import re
-        import time
+    missing_stdlib = [name for name in STDLIB_MODULES if not _resolves(name)]
+    if missing_stdlib:
+        errors.append(f"Standard library import error: {', '.join(missing_stdlib)}")
+        print(f"✗ Standard library imports: FAILED - {', '.join(missing_stdlib)}")
+    else:
         print("✓ Standard library imports: OK")
-    except ImportError as e:
-        errors.append(f"Standard library import error: {e}")
-        print(f"✗ Standard library imports: FAILED - {e}")
     
     # Check third-party imports
-    try:
-        import pytest
-        print("✓ PyTest: OK")
-    except ImportError:
-        errors.append("pytest not installed")
-        print("✗ PyTest: NOT INSTALLED (run: pip install pytest)")
-    
-    try:
-        from selenium import webdriver
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.common.keys import Keys
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        print("✓ Selenium: OK")
-    except ImportError:
-        errors.append("selenium not installed")
-        print("✗ Selenium: NOT INSTALLED (run: pip install selenium)")
-    
-    try:
-        from webdriver_manager.chrome import ChromeDriverManager
-        print("✓ webdriver-manager: OK")
-    except ImportError:
-        errors.append("webdriver-manager not installed")
-        print("✗ webdriver-manager: NOT INSTALLED (run: pip install webdriver-manager)")
-    
-    # Check project imports
-    try:
-        from utils.driver_factory import DriverFactory
-        print("✓ utils.driver_factory: OK")
-    except ImportError as e:
-        errors.append(f"utils.driver_factory import error: {e}")
-        print(f"✗ utils.driver_factory: FAILED - {e}")
-    
-    try:
-        from utils.wait_utils import WaitUtils
-        print("✓ utils.wait_utils: OK")
-    except ImportError as e:
-        errors.append(f"utils.wait_utils import error: {e}")
-        print(f"✗ utils.wait_utils: FAILED - {e}")
-    
-    try:
-        from pages.chat_page import ChatPage
-        print("✓ pages.chat_page: OK")
-    except ImportError as e:
-        errors.append(f"pages.chat_page import error: {e}")
-        print(f"✗ pages.chat_page: FAILED - {e}")
-    
-    # Check test files
-    try:
-        import tests.test_chat_ui
-        print("✓ tests.test_chat_ui: OK")
-    except ImportError as e:
-        errors.append(f"tests.test_chat_ui import error: {e}")
-        print(f"✗ tests.test_chat_ui: FAILED - {e}")
-    
-    try:
-        import tests.test_ai_responses
-        print("✓ tests.test_ai_responses: OK")
-    except ImportError as e:
-        errors.append(f"tests.test_ai_responses import error: {e}")
-        print(f"✗ tests.test_ai_responses: FAILED - {e}")
+    for module, display_name, install_hint in DEPENDENCIES:
+        if _resolves(module):
+            print(f"✓ {display_name}: OK")
+        else:
+            errors.append(f"{module} not installed")
+            print(f"✗ {display_name}: NOT INSTALLED (run: {install_hint})")
     
-    try:
-        import tests.test_security
-        print("✓ tests.test_security: OK")
-    except ImportError as e:
-        errors.append(f"tests.test_security import error: {e}")
-        print(f"✗ tests.test_security: FAILED - {e}")
+    # Check project imports (resolve + compile, so syntax errors surface without running code)
+    for module in PROJECT_MODULES:
+        try:
+            spec = importlib.util.find_spec(module)
+            if spec is None:
+                raise ImportError(f"No module named '{module}'")
+            spec.loader.get_code(module)
+            print(f"✓ {module}: OK")
+        except (ImportError, SyntaxError) as e:
+            errors.append(f"{module} import error: {e}")
+            print(f"✗ {module}: FAILED - {e}")
     
     # Check data file
     try:
-        import json
-        from pathlib import Path
-        data_path = Path("data") / "test_data.json"
-        if data_path.exists():
-            with open(data_path, "r", encoding="utf-8") as f:
-                json.load(f)
+        if TEST_DATA_PATH.exists():
+            raw = TEST_DATA_PATH.read_bytes()
+            if orjson:
+                orjson.loads(raw)
+            else:
+                json.loads(raw)
             print("✓ test_data.json: OK (valid JSON)")
         else:
             errors.append("test_data.json not found")